@@ -0,0 +1,21 @@
+"""
+Package: tests
+
+Shared setup for the test suites. The database engine is a module-global
+singleton owned by Flask-SQLAlchemy, so its connection pool is disposed
+once at interpreter exit rather than per test class.
+
+Nothing is imported at module level here: this package is imported before
+tests/conftest.py, which must configure DATABASE_URI before the service
+(and its engine) is first loaded.
+"""
+import atexit
+
+
+def _dispose_engine():
+    """Return pooled connections to the database when the test run exits"""
+    from service.models import db  # pylint: disable=import-outside-toplevel
+    db.engine.dispose()
+
+
+atexit.register(_dispose_engine)
@@ -0,0 +1,178 @@
+# Copyright 2016, 2023 John J. Rofrano. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Shared pytest fixtures for the test suites
+
+The database is configured and initialized once per pytest session rather
+than once per test class, and every test runs inside an external
+transaction that is rolled back afterwards so no test leaves data behind.
+"""
+import os
+import logging
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# The suites run against an in-memory SQLite database by default so they
+# need no running server; point DATABASE_URI at a Postgres instance
+# ('make tests-pg' does this) to exercise the production dialect and the
+# Postgres-only paths (TRUNCATE, COPY seeding, per-worker databases)
+DATABASE_URI = os.getenv("DATABASE_URI", "sqlite://")
+
+# Django-style --reuse-db: set REUSE_DB=1 to skip schema creation when the
+# tables already exist from an earlier run
+REUSE_DB = os.getenv("REUSE_DB", "0") in ("1", "true", "True")
+
+
+def _is_memory_sqlite(uri):
+    """Report whether the URI names an in-memory SQLite database"""
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _ensure_database(url):
+    """Create a per-worker Postgres database if it does not already exist"""
+    admin = create_engine(url.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    with admin.connect() as connection:
+        # Serialize workers on first-run provisioning: concurrent CREATE
+        # DATABASE calls share the template database and fail with
+        # "source database is being accessed by other users"
+        connection.execute(text("SELECT pg_advisory_lock(hashtext('product-test-db'))"))
+        try:
+            exists = connection.execute(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": url.database},
+            ).scalar()
+            if not exists:
+                connection.execute(text(f'CREATE DATABASE "{url.database}"'))
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(hashtext('product-test-db'))"))
+    admin.dispose()
+
+
+def _worker_database_uri(uri):
+    """Give each pytest-xdist worker its own database
+
+    When the suite runs under ``pytest -n``, the worker id (gw0, gw1, ...)
+    is appended to the database name so workers cannot see each other's
+    rows. Single-process runs use the URI unchanged.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker is None:
+        return uri
+    url = make_url(uri)
+    if url.get_backend_name() == "sqlite":
+        if not url.database or url.database == ":memory:":
+            return uri  # in-memory databases are per-process already
+        return f"{uri}_{worker}"
+    url = url.set(database=f"{url.database}_{worker}")
+    _ensure_database(url)
+    return url.render_as_string(hide_password=False)
+
+
+DATABASE_URI = _worker_database_uri(DATABASE_URI)
+# The service reads DATABASE_URI at import time, so the worker-specific
+# value must be exported before the app is imported
+os.environ["DATABASE_URI"] = DATABASE_URI
+
+# pylint: disable=wrong-import-position
+from service import app as flask_app  # noqa: E402
+from service.models import db, init_db, Product  # noqa: E402
+
+
+def _enable_sqlite_savepoints(engine):
+    """Make SAVEPOINTs transactional on SQLite
+
+    The pysqlite driver implicitly commits around SAVEPOINT statements,
+    which would silently break the rollback-based test isolation. Taking
+    over transaction control is the workaround documented by SQLAlchemy.
+    """
+    @event.listens_for(engine, "connect")
+    def _do_connect(dbapi_connection, _connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _do_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session", autouse=True, name="app")
+def app_fixture():
+    """Configure the Flask app and initialize the database once per session"""
+    flask_app.config["TESTING"] = True
+    flask_app.config["DEBUG"] = False
+    flask_app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URI
+    # Keep per-attribute change signals and SQL echo off under test;
+    # both add dispatch overhead on every field write and statement
+    flask_app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    flask_app.config["SQLALCHEMY_ECHO"] = False
+    if _is_memory_sqlite(DATABASE_URI):
+        # One shared connection keeps the in-memory database visible to
+        # every session and test client request
+        flask_app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False},
+        }
+    else:
+        # Pool connections so tests amortize the connect handshake;
+        # pre_ping recovers stale connections instead of failing mid-suite
+        flask_app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+            "pool_size": 10,
+            "max_overflow": 20,
+            "pool_pre_ping": True,
+            "pool_recycle": 300,
+        }
+    flask_app.logger.setLevel(logging.CRITICAL)
+    if REUSE_DB and not _is_memory_sqlite(DATABASE_URI):
+        # The schema survives from an earlier run; re-register the app
+        # with the test configuration without paying for create_all
+        db.init_app(flask_app)
+        flask_app.app_context().push()
+    else:
+        init_db(flask_app)
+    if db.engine.dialect.name == "sqlite":
+        _enable_sqlite_savepoints(db.engine)
+    # Start from a clean slate; TRUNCATE skips Postgres's per-row WAL
+    # logging and resets the id sequence, unlike a bulk DELETE
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(text("TRUNCATE TABLE product RESTART IDENTITY CASCADE"))
+    else:
+        db.session.query(Product).delete()
+    db.session.commit()
+    db.session.remove()
+    yield flask_app
+
+
+@pytest.fixture(autouse=True, name="db_session")
+def db_session_fixture(app):  # pylint: disable=unused-argument, redefined-outer-name
+    """Run each test inside an external transaction that is rolled back
+
+    The session is re-bound to a dedicated connection whose transaction is
+    never committed, so per-test cleanup is an in-memory rollback instead
+    of DELETE + COMMIT round trips.
+    """
+    connection = db.engine.connect()
+    transaction = connection.begin()
+    original_session = db.session
+    db.session = scoped_session(
+        sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
+    )
+    yield db.session
+    db.session.remove()
+    transaction.rollback()
+    connection.close()
+    db.session = original_session
@@ -17,9 +17,12 @@
 """
 Test Factory to make fake objects for testing
 """
+import csv
+import io
+from functools import lru_cache
 import factory
 from factory.fuzzy import FuzzyChoice, FuzzyDecimal
-from service.models import Product, Category
+from service.models import Product, Category, db
 
 
 class ProductFactory(factory.Factory):
@@ -38,3 +41,57 @@ class ProductFactory(factory.Factory):
     category = FuzzyChoice(choices=[Category.UNKNOWN, Category.CLOTHS, Category.FOOD, Category.HOUSEWARES,
                                     Category.AUTOMOTIVE, Category.TOOLS])
     # Add code to create Fake Products
+
+
+@lru_cache(maxsize=None)
+def _seed_snapshots(count: int) -> tuple:
+    """Build and cache attribute snapshots for a reference dataset of products"""
+    return tuple(product.serialize() for product in ProductFactory.create_batch(count))
+
+
+def _copy_products(snapshots):
+    """Bulk-load product snapshots with Postgres COPY FROM STDIN
+
+    COPY bypasses per-row parse/plan work, and running it on the session's
+    own connection keeps the rows inside the test transaction so the
+    per-test rollback still cleans them up.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for snapshot in snapshots:
+        writer.writerow([
+            snapshot["name"],
+            snapshot["description"],
+            snapshot["price"],
+            snapshot["available"],
+            snapshot["category"],
+        ])
+    buffer.seek(0)
+    cursor = db.session.connection().connection.cursor()
+    cursor.copy_expert(
+        "COPY product (name, description, price, available, category) FROM STDIN WITH CSV",
+        buffer,
+    )
+
+
+def seed_products(count: int) -> list:
+    """Insert a reference dataset of products in one batch and return it
+
+    The factory output is memoized per count so Faker only runs once per
+    test session; the rows themselves are inserted inside the caller's
+    transaction and vanish with the per-test rollback, so tests that only
+    read the dataset pay a single bulk load instead of one create/commit
+    round trip per product. On Postgres the load uses COPY FROM STDIN;
+    other dialects fall back to a single batched INSERT.
+    """
+    snapshots = _seed_snapshots(count)
+    if db.session.get_bind().dialect.name == "postgresql":
+        _copy_products(snapshots)
+        db.session.commit()
+        # COPY does not report generated keys, so read the rows back
+        products = Product.query.order_by(Product.id.desc()).limit(count).all()
+        return products[::-1]
+    products = [Product().deserialize(snapshot) for snapshot in snapshots]
+    db.session.add_all(products)
+    db.session.commit()
+    return products